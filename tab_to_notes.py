@@ -2,10 +2,10 @@
 
 
 import argparse
-import math
+import functools
 import pathlib
 import re
-from collections import OrderedDict
+from collections import namedtuple
 
 
 TRANSPOSING_TABLE = {
@@ -24,6 +24,53 @@ NOTES_FLATS = {"C" : 0, "Db" : 1,  "D": 2, "Eb" : 3, "E": 4, "F": 5,
 SHARP_NAMES = dict([(v, k) for (k, v) in NOTES_SHARPS.items()])
 FLAT_NAMES = dict([(v, k) for (k, v) in NOTES_FLATS.items()])
 
+# Upper-cased note names for recognizing tuning indicators per line
+VALID_NOTE_NAMES = (frozenset(k.upper() for k in NOTES_SHARPS)
+                    | frozenset(k.upper() for k in NOTES_FLATS))
+
+# Compiled once here instead of on every line. Note the '+' in the
+# technique class is a literal plus inside [...], so '+' never shows
+# up as a technique; kept as is to preserve behavior. SCAN_RE picks
+# up frets (group 1) and techniques (group 2) in a single pass.
+FRET_RE = re.compile(r"\d+")
+SCAN_RE = re.compile(r"(\d+)|([^-\d+]+)")
+
+# Translation table that deletes digits, for stripping octave numbers
+NONDIGIT_TABLE = str.maketrans('', '', '0123456789')
+
+# One fret (or technique) occurrence on a tab line. A namedtuple is
+# both smaller and faster to read than the per-match dicts it replaced.
+Fret = namedtuple('Fret', ['value', 'start', 'end', 'width'])
+
+def build_triad_table():
+    """
+    Builds a lookup from interval bitmask to chord-type suffix.
+
+    Bit i of the mask is set when interval i (in semitones from the
+    root) is present. Enumerating all 4096 masks up front keeps the
+    pattern priority of the old if-chain while making classification
+    in analyze_triad a single dict probe.
+    """
+    table = {}
+    for mask in range(1 << 12):
+        if mask & 0b010001000 == 0b010001000:       # m3 + P5
+            table[mask] = "m"
+        elif mask & 0b010010000 == 0b010010000:     # M3 + P5
+            table[mask] = "maj"
+        elif mask & 0b001001000 == 0b001001000:     # m3 + TT
+            table[mask] = "dim"
+        elif mask & 0b100010000 == 0b100010000:     # M3 + m6
+            table[mask] = "aug"
+        elif mask == 1 << 7:                        # bare P5
+            table[mask] = "5"
+        elif mask == 1 << 4:                        # bare M3
+            table[mask] = "(M3)"
+        elif mask == 1 << 3:                        # bare m3
+            table[mask] = "(m3)"
+    return table
+
+TRIAD_TABLE = build_triad_table()
+
 # Chord and interval abbreviations with descriptions
 CHORD_ABBREVIATIONS = {
     "unison": ("1", "Unison (same note)"),
@@ -40,6 +87,16 @@ CHORD_ABBREVIATIONS = {
     "major 7th": ("M7", "Major seventh")
 }
 
+# Chord symbol legend entries, keyed by the substring that marks them.
+# Minor is handled separately since 'm' is also a substring of 'maj'.
+CHORD_SYMBOL_TAGS = (
+    ('maj', 'maj=Major'),
+    ('dim', 'dim=Diminished'),
+    ('aug', 'aug=Augmented'),
+    ('5', '5=Power chord'),
+    ('sus', 'sus=Suspended')
+)
+
 def build_filtered_legend(used_chord_types):
     """
     Build legend showing only chord types that appear in the document
@@ -56,21 +113,12 @@ def build_filtered_legend(used_chord_types):
                 legend_items.append(f"{abbrev}: {desc}")
     
     # Add chord symbol explanations for any used chord types
-    chord_symbols = []
-    for chord_type in used_chord_types:
-        if 'maj' in chord_type and 'maj=Major' not in chord_symbols:
-            chord_symbols.append('maj=Major')
-        if 'm' in chord_type and chord_type != 'maj' and 'm=Minor' not in chord_symbols:
-            chord_symbols.append('m=Minor')
-        if 'dim' in chord_type and 'dim=Diminished' not in chord_symbols:
-            chord_symbols.append('dim=Diminished')
-        if 'aug' in chord_type and 'aug=Augmented' not in chord_symbols:
-            chord_symbols.append('aug=Augmented')
-        if '5' in chord_type and '5=Power chord' not in chord_symbols:
-            chord_symbols.append('5=Power chord')
-        if 'sus' in chord_type and 'sus=Suspended' not in chord_symbols:
-            chord_symbols.append('sus=Suspended')
-    
+    chord_symbols = {desc for chord_type in used_chord_types
+                     for tag, desc in CHORD_SYMBOL_TAGS if tag in chord_type}
+    if any('m' in chord_type and 'maj' not in chord_type
+           for chord_type in used_chord_types):
+        chord_symbols.add('m=Minor')
+
     legend = "\n--- Chord/Interval Legend ---\n"
     if legend_items:
         legend += "\n".join(sorted(set(legend_items))) + "\n"
@@ -79,20 +127,25 @@ def build_filtered_legend(used_chord_types):
     
     return legend
 
-def fretsFromLine(line):
+def scanLine(line, want_techniques):
     """
-    Creates a dict with fret info including position, width, and value
+    Creates a list of Fret records with position, width, and value.
+
+    Frets and techniques come out of one scan of the line; techniques
+    are simply skipped when not wanted.
     """
-    
-    result = {}
-    # next line doesn't work for tremolo arm and harmonics
-    for m in re.finditer(r"\d+", line):
-        result[m.start()] = {
-            'value': m.group(0),
-            'start': m.start(),
-            'end': m.end() - 1,
-            'width': len(m.group(0))
-        }
+
+    # the scan doesn't work for tremolo arm and harmonics
+    result = []
+    for m in SCAN_RE.finditer(line):
+        fret = m.group(1)
+        if fret is not None:
+            # Fret numbers are parsed here once; techniques stay strings
+            result.append(Fret(int(fret), m.start(), m.end() - 1,
+                               len(fret)))
+        elif want_techniques:
+            result.append(Fret(m.group(0), m.start(), m.end() - 1,
+                               len(m.group(0))))
     return result
 
 def group_by_timing(notedict):
@@ -102,104 +155,129 @@ def group_by_timing(notedict):
     """
     
     # Collect all fret positions from all strings
-    all_frets = []
-    for string_note, frets in notedict.items():
-        for pos, fret_info in frets.items():
-            all_frets.append((string_note, pos, fret_info))
+    all_frets = [(string_note, fret_info.start, fret_info)
+                 for string_note, frets in notedict.items()
+                 for fret_info in frets]
     
     # Sort by position for efficient grouping
     all_frets.sort(key=lambda x: x[1])
-    
+
     timing_groups = {}
-    
+
+    # Since frets are sorted by start position, a single sweep suffices:
+    # a fret can only ever overlap a member of the most recent group, so
+    # older groups need not be revisited.
+    current_group = None
+
     for string_note, pos, fret_info in all_frets:
-        # Find which timing group this fret belongs to
         group_found = False
-        
-        for timing_pos, group in timing_groups.items():
-            # Check if this fret overlaps with any fret in this group
-            for _, _, existing_fret, _ in group:
-                # Check for position overlap (±1 tolerance)
-                fret_range = range(fret_info['start'], fret_info['end'] + 1)
-                existing_range = range(existing_fret['start'], existing_fret['end'] + 1)
-                
-                if (set(fret_range) & set(existing_range) or 
-                    abs(fret_info['start'] - existing_fret['start']) <= 1 or
-                    abs(fret_info['end'] - existing_fret['end']) <= 1):
-                    
+        start = fret_info.start
+        end = fret_info.end
+        width = fret_info.width
+
+        if current_group is not None:
+            # Check if this fret overlaps with any fret in the current group
+            for _, _, existing_fret, _ in current_group:
+                e_start = existing_fret.start
+                e_end = existing_fret.end
+
+                # Check for position overlap (±1 tolerance); frets come
+                # in sorted order so start - e_start is never negative
+                if (start <= e_end or
+                    start - e_start <= 1 or
+                    abs(end - e_end) <= 1):
+
                     # Determine if this is uncertain alignment
-                    uncertain = (fret_info['start'] < existing_fret['start'] and 
-                               fret_info['width'] == 1 and existing_fret['width'] > 1)
-                    
-                    group.append((string_note, pos, fret_info, uncertain))
+                    uncertain = (start < e_start and
+                               width == 1 and existing_fret.width > 1)
+
+                    current_group.append((string_note, pos, fret_info, uncertain))
                     group_found = True
                     break
-            
-            if group_found:
-                break
-        
+
         if not group_found:
             # Create new timing group
-            timing_groups[pos] = [(string_note, pos, fret_info, False)]
-    
+            current_group = [(string_note, pos, fret_info, False)]
+            timing_groups[pos] = current_group
+
     return timing_groups
     
-def addTechniquesFromLine(line, fret_position_dict):
+@functools.lru_cache(maxsize=64)
+def parse_string_note(stringNote):
     """
-    Adds the used techniques from the tab with position on the line
-    as index.
+    Parses a string tuning like "E4" into (base_semitone, base_octave).
+
+    Cached because the same handful of tuning strings is parsed for
+    every fret on every line.
     """
-    # next line doesn't work for tremolo arm and harmonics
-    for m in re.finditer(r"[^-\d+]+", line):
-        if not m.start() in fret_position_dict.keys():
-            fret_position_dict[m.start()] = {
-                'value': m.group(0),
-                'start': m.start(),
-                'end': m.end() - 1,
-                'width': len(m.group(0))
-            }
-            
-    return fret_position_dict
+
+    m = FRET_RE.search(stringNote)
+    base_octave = int(m.group(0)) if m else 0
+
+    baseNote = NOTES_SHARPS[stringNote.translate(NONDIGIT_TABLE).upper()]
+    return (baseNote, base_octave)
 
 def GetNote(stringNote, fretNum, settings):
     """
     Gets the note if a number, otherwise return the character
     """
-    
-    if not fretNum.isnumeric():
+
+    if not isinstance(fretNum, int):
         return fretNum
 
-    base_octave = "".join([c for c in stringNote if c.isdigit()])
-    if base_octave.isdigit():
-        base_octave = int(base_octave)
+    # The (string, fret) domain is tiny (a handful of strings times
+    # ~25 frets), so the arithmetic and formatting run once per
+    # combination and come out of the cache afterwards.
+    note_cache = settings['note_cache']
+    name = note_cache.get((stringNote, fretNum))
+    if name is None:
+        baseNote, base_octave = parse_string_note(stringNote)
+        noteNum = baseNote + fretNum + settings['transpose']
+        octave, fretNoteNum = divmod(noteNum, 12)
+        octave += base_octave
+        name = settings['format_note'](fretNoteNum, octave)
+        note_cache[(stringNote, fretNum)] = name
+
+    return name
+
+def make_note_formatter(settings):
+    """
+    Builds a note formatting function with the output options baked in.
+
+    The sharps/flats, octave and spacing settings never change within
+    a document, so the per-note branches collapse into one closure
+    that is created once in proces_doc.
+    """
+
+    names = FLAT_NAMES if settings['write_flats'] else SHARP_NAMES
+    names_table = tuple(names[i] for i in range(12))
+    # The octave digits can never be accidentals, so whether a name
+    # gets the alignment space depends on the semitone alone
+    if settings['add_space']:
+        space_table = tuple('' if ('#' in n or 'b' in n) else ' '
+                            for n in names_table)
     else:
-        base_octave = 0
+        space_table = ('',) * 12
 
-    baseNote = NOTES_SHARPS[stringNote.upper().replace(
-                                                str(base_octave),'')]
-    noteNum = baseNote + int(fretNum) + settings['transpose']
-    fretNoteNum = noteNum % 12
-    octave = math.floor(noteNum / 12) + base_octave
-    
-    if settings['write_sharps']:
-        name = SHARP_NAMES[fretNoteNum]
-    if settings['write_flats']:
-        name = FLAT_NAMES[fretNoteNum]
     if settings['write_octaves']:
-        name = name + str(octave)
-        
-    if settings['add_space']:
-        if not ('#' in name or 'b' in name):
-            name = name + ' '
+        def format_note(fretNoteNum, octave):
+            return (names_table[fretNoteNum] + str(octave)
+                    + space_table[fretNoteNum])
+    else:
+        # Without octaves the whole name is known up front
+        combined_table = tuple(n + s for n, s in zip(names_table, space_table))
 
-    return name
+        def format_note(fretNoteNum, octave):
+            return combined_table[fretNoteNum]
+
+    return format_note
 
 def get_note_number(note_name):
     """
     Convert note name to semitone number (0-11), ignoring octave
     """
     # Remove octave numbers
-    clean_note = ''.join([c for c in note_name if not c.isdigit()])
+    clean_note = note_name.translate(NONDIGIT_TABLE)
     
     if clean_note in NOTES_SHARPS:
         return NOTES_SHARPS[clean_note]
@@ -224,15 +302,25 @@ def analyze_chord(notes):
             note_nums.append(num)
     
     note_nums.sort()
-    
+
+    return classify_chord(tuple(note_nums))
+
+@functools.lru_cache(maxsize=512)
+def classify_chord(note_nums):
+    """
+    Classifies a sorted tuple of unique semitone numbers.
+
+    Cached since the same chord shapes repeat throughout a song; a
+    repeated shape costs one hash lookup instead of a re-analysis.
+    """
     if len(note_nums) == 1:
-        return ["unison"]
+        return ("unison",)
     elif len(note_nums) == 2:
-        return analyze_interval(note_nums)
+        return tuple(analyze_interval(note_nums))
     elif len(note_nums) >= 3:
-        return analyze_triad(note_nums)
-    
-    return []
+        return tuple(analyze_triad(note_nums))
+
+    return ()
 
 def analyze_interval(note_nums):
     """
@@ -266,32 +354,19 @@ def analyze_triad(note_nums):
     Analyze three or more note chord
     """
     results = []
-    
+
     # Try each note as potential root
-    for i, root in enumerate(note_nums):
-        intervals = []
+    for root in note_nums:
+        # Encode the intervals above this root as a 12-bit mask
+        mask = 0
         for note in note_nums:
             if note != root:
-                intervals.append((note - root) % 12)
-        intervals.sort()
-        
+                mask |= 1 << ((note - root) % 12)
+
         # Check for common triad patterns
-        root_name = SHARP_NAMES[root]
-        
-        if 3 in intervals and 7 in intervals:
-            results.append(f"{root_name}m")
-        elif 4 in intervals and 7 in intervals:
-            results.append(f"{root_name}maj")
-        elif 3 in intervals and 6 in intervals:
-            results.append(f"{root_name}dim")
-        elif 4 in intervals and 8 in intervals:
-            results.append(f"{root_name}aug")
-        elif 7 in intervals and len(intervals) == 1:
-            results.append(f"{root_name}5")
-        elif 4 in intervals and len(intervals) == 1:
-            results.append(f"{root_name}(M3)")
-        elif 3 in intervals and len(intervals) == 1:
-            results.append(f"{root_name}(m3)")
+        suffix = TRIAD_TABLE.get(mask)
+        if suffix is not None:
+            results.append(SHARP_NAMES[root] + suffix)
     
     # If no standard patterns found, check for common intervals
     if not results:
@@ -321,19 +396,11 @@ def extract_notes(tabdict, settings):
     Extracts the notes and techniques from a tabdict
     """
     
-    notedict = {}
-    line_length = 0
-    for stringNote, line in tabdict.items():
-        if len(line) > line_length:
-            line_length = len(line)
-        notedict[stringNote] = fretsFromLine(line)
-        if settings['write_techniques']:
-            notedict[stringNote] = addTechniquesFromLine(
-                                        line, notedict[stringNote])
-
-    return (notedict, line_length)
-
-def format_notedict(notedict, line_length, settings):
+    want_techniques = settings['write_techniques']
+    return {stringNote: scanLine(line, want_techniques)
+            for stringNote, line in tabdict.items()}
+
+def format_notedict(notedict, settings):
     """
     Outputs the notes as a line using timing-based grouping
     """
@@ -342,35 +409,45 @@ def format_notedict(notedict, line_length, settings):
     timing_groups = group_by_timing(notedict)
     
     # Sort timing groups by position
-    sorted_positions = sorted(timing_groups.keys())
+    sorted_positions = sorted(timing_groups)
     
     result = []
     chord_analysis = []
     used_chord_types = set()  # Track chord types used in this line
-    covered_positions = set()
-    
+    chord_start = str(settings["chord_start"])
+    chord_end = str(settings["chord_end"])
+    chord_separator = str(settings["chord_separator"])
+    note_cache = settings['note_cache']
+    with_chord_analysis = settings.get('chord_analysis', False)
+    # Positions are visited in increasing order, so a single watermark
+    # is enough to skip positions already swallowed by an earlier group
+    covered_until = -1
+
     for pos in sorted_positions:
-        if pos in covered_positions:
+        if pos <= covered_until:
             continue
-            
+
         group = timing_groups[pos]
         chord = []
         is_uncertain = False
-        
+
         # Extract notes from this timing group
         for string_note, _, fret_info, uncertain in group:
             if uncertain:
                 is_uncertain = True
-            
-            note_name = GetNote(string_note, fret_info['value'], settings)
+
+            # Probe the note cache directly; GetNote fills it on a miss
+            note_name = note_cache.get((string_note, fret_info.value))
+            if note_name is None:
+                note_name = GetNote(string_note, fret_info.value, settings)
             chord.append(note_name)
-            
+
             # Mark all positions in this fret as covered
-            for i in range(fret_info['start'], fret_info['end'] + 1):
-                covered_positions.add(i)
+            if fret_info.end > covered_until:
+                covered_until = fret_info.end
         
         # Analyze chord if enabled
-        if settings.get('chord_analysis', False):
+        if with_chord_analysis:
             analysis = analyze_chord(chord)
             if analysis:
                 # Show multiple interpretations separated by /
@@ -382,34 +459,31 @@ def format_notedict(notedict, line_length, settings):
             else:
                 chord_analysis.append('-')
         
-        # Format the chord output
+        # Format the chord output; a group always holds at least its
+        # founding fret, so there is no empty case
         if len(chord) == 1:
             chord_str = chord[0]
-        elif len(chord) > 1:
-            chord_str = (str(settings["chord_start"]) + 
-                        str(settings["chord_separator"]).join(chord) + 
-                        str(settings["chord_end"]))
         else:
-            chord_str = '-'
-            
+            chord_str = f"{chord_start}{chord_separator.join(chord)}{chord_end}"
+
         # Add uncertainty marker if needed
         if is_uncertain:
             chord_str += '?'
-            
+
         result.append(chord_str)
     
     # Build output lines
     output_lines = []
     
     # Add chord analysis line if enabled
-    if settings.get('chord_analysis', False) and chord_analysis:
+    if with_chord_analysis and chord_analysis:
         analysis_line = ' '.join(chord_analysis)
         output_lines.append(analysis_line + '\n')
-    
+
     # Add note line
-    output_lines.append('|' + '--'.join(result) + '|' + '\n')
-    
-    if settings.get('chord_analysis', False):
+    output_lines.append(f"|{'--'.join(result)}|\n")
+
+    if with_chord_analysis:
         return output_lines, used_chord_types
     else:
         return output_lines
@@ -417,15 +491,14 @@ def format_notedict(notedict, line_length, settings):
 def proces_tabdict(tabdict, settings):
     result = []
     used_chord_types = set()
-    notedict, line_length = extract_notes(tabdict, settings)
-    #print("Processing ascii tab with length: %s" % line_length)
+    notedict = extract_notes(tabdict, settings)
     if settings.get('chord_analysis', False):
-        output_lines, chord_types = format_notedict(notedict, line_length, settings)
+        output_lines, chord_types = format_notedict(notedict, settings)
         result.extend(output_lines)
         used_chord_types.update(chord_types)
     else:
         # For non-chord analysis, format_notedict returns only lines
-        output_lines = format_notedict(notedict, line_length, settings)
+        output_lines = format_notedict(notedict, settings)
         if isinstance(output_lines, tuple):
             result.extend(output_lines[0])
         else:
@@ -434,72 +507,70 @@ def proces_tabdict(tabdict, settings):
 
 def proces_doc(doc, settings):
     """
-    Proceses the document and returns a result document.
+    Proceses the document and yields the result lines.
 
-    Both documents asre lists of strings.
+    The input is an iterable of strings; lines are generated one by
+    one so large documents can be streamed straight into writelines.
     """
-    resultdoc = []
     all_used_chord_types = set()  # Track all chord types used in document
+    settings['format_note'] = make_note_formatter(settings)
+    settings['note_cache'] = {}
     tab_nr = 0
     tab = False
-    tabdict = OrderedDict()
+    tabdict = {}
     string_nr = 0       # we count from top
     tuning = settings['tuning']
+    tuning_separator = settings['tuning_separator']
+    write_octaves = settings['write_octaves']
+
+    def flush_tab():
+        nonlocal tab, string_nr, tabdict
+        tab_result, chord_types = proces_tabdict(tabdict, settings)
+        all_used_chord_types.update(chord_types)
+        tab = False
+        string_nr = 0
+        tabdict = {}
+        return tab_result
+
     for line in doc:
-        if settings['tuning_separator'] in line:
-            noteName = line.split(settings['tuning_separator'])[0].strip()
-            if noteName.upper() in NOTES_SHARPS.keys() \
-            or noteName.upper() in [x.upper() for x in NOTES_FLATS.keys()]:
+        # One scan gives both the tuning indicator and the tab body
+        head, sep, tail = line.partition(tuning_separator)
+        if sep:
+            noteName = head.strip()
+            tab_body = tail.strip()[:-1]
+            if noteName.upper() in VALID_NOTE_NAMES:
                 tab = True
                 string_nr = string_nr + 1
-                if settings['write_octaves']:
-                    tabdict[tuning[string_nr]] = line.split(
-                        settings['tuning_separator'], 1)[1].strip()[:-1]
+                if write_octaves:
+                    tabdict[tuning[string_nr]] = tab_body
                 else:
-                    tabdict[noteName + str(string_nr)] = line.split(
-                        settings['tuning_separator'], 1)[1].strip()[:-1]
-            elif noteName == "" and line.startswith(settings['tuning_separator']):
+                    tabdict[noteName + str(string_nr)] = tab_body
+            elif head == "":
                 # Handle tablature without string tuning indicators (assumes standard tuning)
                 tab = True
                 string_nr = string_nr + 1
                 if string_nr <= 6:  # Limit to 6 strings max
-                    if settings['write_octaves']:
-                        tabdict[tuning[string_nr]] = line.split(
-                            settings['tuning_separator'], 1)[1].strip()[:-1]
+                    if write_octaves:
+                        tabdict[tuning[string_nr]] = tab_body
                     else:
-                        tabdict[tuning[string_nr] + str(string_nr)] = line.split(
-                            settings['tuning_separator'], 1)[1].strip()[:-1]
+                        tabdict[tuning[string_nr] + str(string_nr)] = tab_body
             elif tab:
-                tab_result, chord_types = proces_tabdict(tabdict, settings)
-                resultdoc.extend(tab_result)
-                all_used_chord_types.update(chord_types)
-                tab = False
-                string_nr = 0
-                tabdict = OrderedDict()
+                yield from flush_tab()
         else:
             # we just return all other lines
             if tab:
-                tab_result, chord_types = proces_tabdict(tabdict, settings)
-                resultdoc.extend(tab_result)
-                all_used_chord_types.update(chord_types)
-                tab = False
-                string_nr = 0
-                tabdict = OrderedDict()
-            resultdoc.append(line)
-    
+                yield from flush_tab()
+            yield line
+
     # Process any remaining tab data at end of file
     if tab:
-        tab_result, chord_types = proces_tabdict(tabdict, settings)
-        resultdoc.extend(tab_result)
-        all_used_chord_types.update(chord_types)
-    
+        yield from flush_tab()
+
     # Add filtered legend if chord analysis is enabled
     if settings.get('chord_analysis', False):
         filtered_legend = build_filtered_legend(all_used_chord_types)
         if filtered_legend:
-            resultdoc.append(filtered_legend)
-            
-    return resultdoc
+            yield filtered_legend
 
 if __name__ == "__main__":
     
@@ -601,7 +672,7 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
     
-    if args.transpose in TRANSPOSING_TABLE.keys():
+    if args.transpose in TRANSPOSING_TABLE:
         transpose = TRANSPOSING_TABLE[args.transpose]
     elif type(args.transpose) == str and args.transpose.isnumeric():
         transpose = int(args.transpose)
@@ -631,14 +702,12 @@ if __name__ == "__main__":
                                 6: s6_tuning }
     }
     
-    with open(args.tab_file) as f:
-        doc = f.readlines()
-    
-    result = proces_doc(doc, settings)
-    
+    # Iterate the input file directly and stream the generated result,
+    # so neither document is ever held in memory as a whole
     if args.result:
-        with open(args.result,'w') as f:
-            f.writelines(result)
+        with open(args.tab_file) as f_in, open(args.result, 'w') as f_out:
+            f_out.writelines(proces_doc(f_in, settings))
     else:
-        for line in result:
-            print(line, end='')
+        with open(args.tab_file) as f_in:
+            for line in proces_doc(f_in, settings):
+                print(line, end='')